@@ -1,31 +1,110 @@
 import asyncio
-import json
 import os
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import ValidationError
+from watchfiles import awatch
 
 from app.routes.presentation.schemas import (
     PresentationDownloadResponse,
     PresentationRequest,
     PresentationResponse,
 )
-from app.routes.presentation.utils import generate_pprt_id
+from app.routes.presentation.utils import (
+    cached_exists,
+    generate_pprt_id,
+    invalidate_exists_cache,
+)
 from core.consts import FILE_PATH
 from core.logger_config import logger
-from mcp_server.workflow import run_ppt_workflow
+from mcp_server.workflow import close_mcp_session, run_ppt_workflow
 
 presentation_router = APIRouter(
     prefix="/presentation",
     tags=["presentation"],
 )
 
+# Maps pprt_id -> event set once the workflow has finished writing the pptx,
+# so SSE streams are woken immediately instead of polling the filesystem.
+_ready_events: dict[str, asyncio.Event] = {}
+
+# In-process job registry: strong references keep scheduled tasks alive, and the
+# semaphore bounds how many generations run at once so concurrent POSTs can't
+# oversubscribe the worker with LLM/scraping work.
+_workflow_tasks: dict[str, asyncio.Task] = {}
+_workflow_errors: dict[str, str] = {}
+_WORKFLOW_CONCURRENCY = asyncio.Semaphore(int(os.getenv("WORKFLOW_CONCURRENCY", "2")))
+
+# Registry entries outlive the workflow only long enough for waiting clients to
+# observe the outcome; after that they are dropped so a client that never
+# connects to the SSE stream can't leak an Event/error string per generation.
+_REGISTRY_LINGER = 60.0  # seconds
+_WORKFLOW_ERRORS_MAX_SIZE = 100
+_cleanup_tasks: set[asyncio.Task] = set()
+
+
+async def _drop_registry_entries(pprt_id: str) -> None:
+    """Removes a finished generation's registry entries after a grace period.
+
+    Args:
+        pprt_id (str): The presentation ID whose entries should be dropped.
+    """
+    await asyncio.sleep(_REGISTRY_LINGER)
+    _ready_events.pop(pprt_id, None)
+    _workflow_errors.pop(pprt_id, None)
+
+
+async def _wait_for_pptx_write(file_path: str) -> None:
+    """Block until the given pptx appears in the output directory.
+
+    Uses inotify/kqueue via watchfiles, so the write is observed within
+    milliseconds without polling.
+
+    Args:
+        file_path (str): The absolute path of the pptx to wait for.
+    """
+    async for changes in awatch(FILE_PATH):
+        if any(changed_path == file_path for _, changed_path in changes):
+            return
+
+
+async def _run_workflow_and_notify(topic: str, num_slides: int, filename: str) -> None:
+    """Run the generation workflow and wake any SSE streams waiting on it.
+
+    Args:
+        topic (str): The topic of the presentation.
+        num_slides (int): The number of slides to generate.
+        filename (str): The presentation ID used as the output filename.
+    """
+    try:
+        async with _WORKFLOW_CONCURRENCY:
+            await run_ppt_workflow(topic=topic, num_slides=num_slides, filename=filename)
+    except Exception as e:
+        logger.error(f"Workflow failed for pprt_id={filename}: {e}")
+        # A failure may mean the MCP subprocess died mid-run; tear the shared
+        # session down so the next workflow spawns a fresh server instead of
+        # reusing a broken pipe.
+        await close_mcp_session()
+        if len(_workflow_errors) >= _WORKFLOW_ERRORS_MAX_SIZE:
+            # Evict the oldest error (dicts preserve insertion order).
+            _workflow_errors.pop(next(iter(_workflow_errors)))
+        _workflow_errors[filename] = str(e)
+    finally:
+        # Drop any stale "missing" stat result so the first post-ready GET is accurate.
+        invalidate_exists_cache(str(FILE_PATH / f"{filename}.pptx"))
+        _workflow_tasks.pop(filename, None)
+        event = _ready_events.get(filename)
+        if event is not None:
+            event.set()
+        cleanup = asyncio.create_task(_drop_registry_entries(filename))
+        _cleanup_tasks.add(cleanup)
+        cleanup.add_done_callback(_cleanup_tasks.discard)
+
 
 @presentation_router.post("/generate_ppt", status_code=202)
-async def generate_ppt(
-    request: PresentationRequest, background_tasks: BackgroundTasks
-) -> PresentationResponse:
+async def generate_ppt(request: PresentationRequest) -> PresentationResponse:
     """
     Generate a PowerPoint presentation based on the given topic and number of slides. The endpoint accepts a topic
     and triggers
@@ -41,8 +120,11 @@ async def generate_ppt(
         f"Generating presentation: topic='{request.topic}', slides={request.slides}, pprt_id={pprt_id}"
     )
     try:
-        background_tasks.add_task(
-            run_ppt_workflow, topic=request.topic, num_slides=request.slides, filename=pprt_id
+        _ready_events[pprt_id] = asyncio.Event()
+        _workflow_tasks[pprt_id] = asyncio.create_task(
+            _run_workflow_and_notify(
+                topic=request.topic, num_slides=request.slides, filename=pprt_id
+            )
         )
         return PresentationResponse(
             message="Presentation generation task created successfully! To retrieve the presentation, please use the pprt_id in the response.",
@@ -64,26 +146,47 @@ async def generate_ppt(
 
 
 @presentation_router.get("/download/{pprt_id}", response_model=None)
-async def download_ppt(pprt_id: str) -> FileResponse | PresentationDownloadResponse:
+async def download_ppt(
+    pprt_id: str, request: Request
+) -> FileResponse | Response | PresentationDownloadResponse:
     """Download the PowerPoint presentation based on the given presentation ID.
 
     Args:
         pprt_id (str): The presentation ID.
+        request (Request): The incoming request, used for conditional-GET headers.
 
     Returns:
-        FileResponse | PresentationDownloadResponse: The file response or the presentation response with the status "Pending" if the presentation is not found.
+        FileResponse | Response | PresentationDownloadResponse: The file response (or a
+        304 if the client already has the current bytes), or the presentation response
+        with the status "Pending" if the presentation is not found.
     """
-    if os.path.exists(f"{FILE_PATH}/{pprt_id}.pptx"):
-        return FileResponse(
-            path=f"{FILE_PATH}/{pprt_id}.pptx",
-            filename=f"{pprt_id}.pptx",
-            media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        )
-    else:
-        return PresentationDownloadResponse(
-            message="Presentation not found. Please check the presentation ID and try again in a few minutes.",
-            status="Pending",
-        )
+    file_path = str(FILE_PATH / f"{pprt_id}.pptx")
+    if cached_exists(file_path):
+        try:
+            # Stat once and hand the result to Starlette: Content-Length/Last-Modified
+            # are known up-front and the file-serving path skips its own stat call.
+            stat_result = os.stat(file_path)
+        except OSError:
+            # The cached "exists" was stale (e.g. the deck was cleaned up
+            # externally inside the TTL window); treat it as not ready.
+            invalidate_exists_cache(file_path)
+        else:
+            # Weak ETag from mtime+size: polling clients that already hold the
+            # current bytes get a bodyless 304 instead of the full deck again.
+            etag = f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            return FileResponse(
+                path=file_path,
+                stat_result=stat_result,
+                filename=f"{pprt_id}.pptx",
+                media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                headers={"ETag": etag},
+            )
+    return PresentationDownloadResponse(
+        message="Presentation not found. Please check the presentation ID and try again in a few minutes.",
+        status="Pending",
+    )
 
 
 @presentation_router.get("/status/{pprt_id}")
@@ -104,21 +207,60 @@ async def presentation_status(pprt_id: str) -> StreamingResponse:
 
     async def event_stream():
         max_wait_time = 1200  # 20 minutes timeout
-        elapsed = 0
-        interval = 30  # Check every 30 seconds
+        heartbeat_interval = 30  # Keep proxies from dropping an idle connection
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait_time
+        event = _ready_events.get(pprt_id)
+
+        while True:
+            if pprt_id in _workflow_errors:
+                error = _workflow_errors.pop(pprt_id)
+                _ready_events.pop(pprt_id, None)
+                yield b"data: " + orjson.dumps({"status": "error", "message": error}) + b"\n\n"
+                return
 
-        while elapsed < max_wait_time:
-            if os.path.exists(file_path):
+            if (event is not None and event.is_set()) or cached_exists(file_path):
                 logger.info(f"SSE: File ready for pprt_id={pprt_id}")
-                yield f"data: {json.dumps({'status': 'ready', 'pprt_id': pprt_id})}\n\n"
+                _ready_events.pop(pprt_id, None)
+                yield b"data: " + orjson.dumps({"status": "ready", "pprt_id": pprt_id}) + b"\n\n"
                 return
-            yield f"data: {json.dumps({'status': 'processing', 'elapsed': elapsed})}\n\n"
-            await asyncio.sleep(interval)
-            elapsed += interval
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            if event is not None:
+                try:
+                    await asyncio.wait_for(
+                        event.wait(), timeout=min(heartbeat_interval, remaining)
+                    )
+                    continue
+                except TimeoutError:
+                    pass
+            else:
+                # No event registered (e.g. after a restart): watch the output
+                # directory instead of polling every 30s.
+                try:
+                    await asyncio.wait_for(
+                        _wait_for_pptx_write(file_path),
+                        timeout=min(heartbeat_interval, remaining),
+                    )
+                    invalidate_exists_cache(file_path)
+                    continue
+                except TimeoutError:
+                    pass
+                except FileNotFoundError:
+                    # Output directory not created yet: last-resort sleep+poll.
+                    await asyncio.sleep(min(heartbeat_interval, remaining))
+
+            elapsed = int(max_wait_time - max(deadline - loop.time(), 0))
+            yield b"data: " + orjson.dumps({"status": "processing", "elapsed": elapsed}) + b"\n\n"
 
         # Timeout reached
         logger.warning(f"SSE: Timeout waiting for pprt_id={pprt_id}")
-        yield f"data: {json.dumps({'status': 'timeout', 'message': 'Generation timed out'})}\n\n"
+        _ready_events.pop(pprt_id, None)
+        yield b"data: " + orjson.dumps({"status": "timeout", "message": "Generation timed out"}) + b"\n\n"
 
     return StreamingResponse(
         event_stream(),
@@ -1,5 +1,52 @@
-import re
-import uuid
+import os
+import secrets
+import string
+import time
+
+# Built once at import: a translate table deleting every ASCII character outside
+# the id allowlist. A single C-level pass per topic, no regex VM involved.
+_ALLOWED_CHARS = set(string.ascii_letters + string.digits + "_-")
+_DELETE_DISALLOWED = str.maketrans(
+    "", "", "".join(chr(i) for i in range(128) if chr(i) not in _ALLOWED_CHARS)
+)
+
+# Maps path -> (expiry timestamp, exists flag). Bounds repeated stat() syscalls
+# from status-polling clients to at most one per path per TTL window.
+_EXISTS_CACHE: dict[str, tuple[float, bool]] = {}
+_EXISTS_TTL = 2.0  # seconds
+_EXISTS_CACHE_MAX_SIZE = 4096
+
+
+def cached_exists(path: str, ttl: float = _EXISTS_TTL) -> bool:
+    """Check whether a file exists, memoizing the result for a short TTL.
+
+    Args:
+        path (str): The filesystem path to check.
+        ttl (float): How long to trust a cached result, in seconds.
+
+    Returns:
+        bool: True if the file exists (possibly up to `ttl` seconds stale).
+    """
+    now = time.monotonic()
+    cached = _EXISTS_CACHE.get(path)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    exists = os.path.exists(path)
+    if len(_EXISTS_CACHE) >= _EXISTS_CACHE_MAX_SIZE:
+        # Evict the oldest entry (dicts preserve insertion order), so one
+        # entry per pprt_id ever requested can't accumulate unbounded.
+        _EXISTS_CACHE.pop(next(iter(_EXISTS_CACHE)))
+    _EXISTS_CACHE[path] = (now + ttl, exists)
+    return exists
+
+
+def invalidate_exists_cache(path: str) -> None:
+    """Drop the cached existence result for a path (e.g. right after it is written).
+
+    Args:
+        path (str): The filesystem path to invalidate.
+    """
+    _EXISTS_CACHE.pop(path, None)
 
 
 def generate_pprt_id(topic: str) -> str:
@@ -11,5 +58,10 @@ def generate_pprt_id(topic: str) -> str:
     Returns:
         str: The unique presentation ID.
     """
-    clean_topic = re.sub(r"[^a-zA-Z0-9_\-]", "", topic.replace(" ", "_"))
-    return f"{clean_topic}-{str(uuid.uuid4())[:5]}"
+    # Non-ASCII is dropped first so the 128-entry table covers everything left.
+    clean_topic = (
+        topic.replace(" ", "_").encode("ascii", "ignore").decode().translate(_DELETE_DISALLOWED)
+    )
+    # 9 random bytes -> 12 url/filename-safe chars: collision-safe for this
+    # domain (the truncated uuid4 only carried ~20 bits) and one bulk urandom read.
+    return f"{clean_topic}-{secrets.token_urlsafe(9)}"
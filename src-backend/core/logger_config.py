@@ -1,8 +1,16 @@
-import structlog
+import logging
+import os
 import sys
 
+import structlog
+
+_LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+
 structlog.configure(
     # ...
+    # The filtering bound logger makes disabled levels a no-op, so debug-only
+    # payload dumps cost nothing on INFO-level runs.
+    wrapper_class=structlog.make_filtering_bound_logger(_LOG_LEVEL),
     logger_factory=structlog.PrintLoggerFactory(file=sys.stderr),
     # ...
 )
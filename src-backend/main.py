@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -5,13 +6,24 @@ from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from app.routes.presentation.router import presentation_router
+from mcp_server.workflow import close_mcp_session
 
 BASE_DIR = Path(__file__).resolve().parent
 
+
+@asynccontextmanager
+async def lifespan(_api: FastAPI):
+    yield
+    # The MCP server subprocess is shared across workflow runs; shut it down
+    # with the app instead of leaking it.
+    await close_mcp_session()
+
+
 api = FastAPI(
     title="Presentation Generator API",
     description="API for generating PowerPoint presentations with a MCP server.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 templates = Jinja2Templates(directory=BASE_DIR / "app" / "templates")
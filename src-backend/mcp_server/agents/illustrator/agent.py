@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import json
 
 from mcp import ClientSession
@@ -5,7 +7,11 @@ from openai import AsyncOpenAI
 
 from core.logger_config import logger
 from core.settings import settings
-from mcp_server.agents.illustrator.schemas import IllustrationResult, VisualAsset
+from mcp_server.agents.illustrator.schemas import (
+    IllustrationResult,
+    VisualAsset,
+    VisualRequestPayload,
+)
 
 
 class IllustratorAgent:
@@ -19,22 +25,21 @@ class IllustratorAgent:
         self.retry_count = 0
 
     async def create_visuals(
-        self, visual_requests: list[dict], session: ClientSession
+        self, visual_requests: list[VisualRequestPayload], session: ClientSession
     ) -> IllustrationResult:
-        """Takes a list of requests (e.g., [{'slide': 1, 'type': 'chart', 'data': {...}}])
+        """Takes a list of visual request payloads
         and calls the appropriate MCP tools to generate them.
 
         Args:
-            visual_requests (List[dict]): _description_
+            visual_requests (list[VisualRequestPayload]): _description_
             session (ClientSession): _description_
 
         Returns:
             IllustrationResult: _description_
         """
         logger.info(f"IlustratorAgent: Creating visuals for {len(visual_requests)} requests")
-        generated_assets = []
 
-        for req in visual_requests:
+        async def make_visual(req: VisualRequestPayload) -> VisualAsset | None:
             slide_num = req.get("slide_number", 0)
             req_type = req.get("type", "")
             prompt = req.get("prompt", "")
@@ -53,16 +58,28 @@ class IllustratorAgent:
                         },
                     )
                     path = result.content[0].text
-                    generated_assets.append(
-                        VisualAsset(
-                            slide_number=slide_num,
-                            asset_type="chart",
-                            description=prompt,
-                            file_path=path,
-                        )
+                    return VisualAsset(
+                        slide_number=slide_num,
+                        asset_type="chart",
+                        description=prompt,
+                        file_path=path,
                     )
 
             except Exception as e:
                 print(f"Failed to create visual for Slide {slide_num}: {e}")
+            return None
+
+        # Each visual is independent, so generate them concurrently over the
+        # session instead of waiting out one chart render at a time; gather
+        # keeps slide order for the returned assets.
+        results = await asyncio.gather(*[make_visual(req) for req in visual_requests])
+        generated_assets = [asset for asset in results if asset is not None]
 
         return IllustrationResult(assets=generated_assets)
+
+
+@functools.lru_cache(maxsize=1)
+def get_illustrator_agent() -> IllustratorAgent:
+    """Returns the shared IllustratorAgent: its OpenAI client (and connection pool)
+    is reused across workflow runs instead of being rebuilt per deck."""
+    return IllustratorAgent()
@@ -1,6 +1,21 @@
+from typing import TypedDict
+
 from pydantic import BaseModel, Field
 
 
+class VisualRequestPayload(TypedDict):
+    """Shape of the per-slide visual request handed to the Illustrator.
+
+    Internal hop only, so a TypedDict keeps construction a plain dict while
+    letting the type checker enforce the keys both stages agree on.
+    """
+
+    slide_number: int
+    type: str
+    prompt: str
+    data_json: dict | None
+
+
 class VisualAsset(BaseModel):
     slide_number: int
     asset_type: str = Field(description="'chart' or 'image'")
@@ -1,3 +1,5 @@
+import functools
+
 from openai import AsyncOpenAI
 
 from core.logger_config import logger
@@ -79,3 +81,10 @@ class PlannerAgent:
                 "Number of slides in the presentation plan does not match the number of slides requested"
             )
         return plan
+
+
+@functools.lru_cache(maxsize=1)
+def get_planner_agent() -> PlannerAgent:
+    """Returns the shared PlannerAgent: its OpenAI client (and connection pool)
+    is reused across workflow runs instead of being rebuilt per deck."""
+    return PlannerAgent()
@@ -1,3 +1,7 @@
+import asyncio
+import functools
+
+from aiolimiter import AsyncLimiter
 from mcp import ClientSession
 from mcp.types import TextContent
 from openai import AsyncOpenAI
@@ -19,23 +23,35 @@ class ResearcherAgent:
         self.retry_count = 0
 
     async def research_web(
-        self, payload: ResearcherPayload, session: ClientSession
+        self,
+        payload: ResearcherPayload,
+        session: ClientSession,
+        search_limiter: AsyncLimiter | None = None,
     ) -> ResearchSummary:
         """Researches the web for information based on the presentation plan.
 
         Args:
             payload (ResearcherPayload): The payload containing the slide title, search queries, and session.
+            search_limiter (AsyncLimiter | None): Rate limiter debited once per
+                search dispatch, so the fan-out can't exceed the provider ceiling.
 
         Returns:
             str: The research results.
         """
-        raw_context = []
-        for query in payload.search_queries:
+        async def run_query(query: str) -> str | None:
+            if search_limiter is not None:
+                await search_limiter.acquire()
             results = await session.call_tool("search_web", arguments={"query": query})
             texts = [c.text for c in results.content if isinstance(c, TextContent)]
             logger.info(f"texts: {texts} results: {results}")
-            if texts:
-                raw_context.append("\n".join(texts))
+            return "\n".join(texts) if texts else None
+
+        # The queries are independent searches, so issue them as one batch
+        # over the session instead of paying each search's latency in turn.
+        query_results = await asyncio.gather(
+            *[run_query(query) for query in payload.search_queries]
+        )
+        raw_context = [result for result in query_results if result]
         if not raw_context:
             return ResearchSummary(slide_topic=payload.slide_title, facts=[])
 
@@ -98,3 +114,10 @@ class ResearcherAgent:
                 return await self.summarize_facts(raw_context, slide_title)
             raise ValueError(f"No response from the agent even after {self.retry_count} retries")
         return summary
+
+
+@functools.lru_cache(maxsize=1)
+def get_researcher_agent() -> ResearcherAgent:
+    """Returns the shared ResearcherAgent: its OpenAI client (and connection pool)
+    is reused across workflow runs instead of being rebuilt per deck."""
+    return ResearcherAgent()
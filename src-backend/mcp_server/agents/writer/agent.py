@@ -1,12 +1,21 @@
+import functools
 import json
 
 from mcp import ClientSession
 from openai import AsyncOpenAI
+from pydantic import TypeAdapter
 
 from core.logger_config import logger
 from core.settings import settings
+from mcp_server.agents.illustrator.schemas import VisualAsset
+from mcp_server.agents.planner.schemas import PresentationPlan
+from mcp_server.agents.researcher.schemas import ResearchSummary
 from mcp_server.agents.writer.prompts import SYSTEM_PROMPT, USER_PROMPT
-from mcp_server.agents.writer.schemas import PresentationContent
+from mcp_server.agents.writer.schemas import PresentationContent, SlidePayload
+
+# Serializes the research summaries in one Rust-backed pass instead of
+# walking the models into dicts and re-serializing with stdlib json.
+_RESEARCH_ADAPTER = TypeAdapter(list[ResearchSummary])
 
 
 class WriterAgent:
@@ -20,15 +29,15 @@ class WriterAgent:
         self.retry_count = 0
 
     async def prepare_presentation(
-        self, topic: str, plan_json: dict, research_data: list[dict]
+        self, topic: str, plan: PresentationPlan, research: list[ResearchSummary]
     ) -> PresentationContent:
         """
         Synthesizes the plan and research into a final slide deck structure.
         """
         logger.info(f"WRITER_AGENT: Drafting content for topic='{topic}'")
 
-        plan_str = json.dumps(plan_json, indent=2)
-        research_str = json.dumps(research_data, indent=2)
+        plan_str = plan.model_dump_json(indent=2)
+        research_str = _RESEARCH_ADAPTER.dump_json(research, indent=2).decode()
 
         try:
             completion = await self.client.beta.chat.completions.parse(
@@ -46,7 +55,7 @@ class WriterAgent:
             )
 
             content = completion.choices[0].message.parsed
-            return await self._validate_response(content, topic, plan_json, research_data)
+            return await self._validate_response(content, topic, plan, research)
 
         except Exception as e:
             logger.error(
@@ -58,26 +67,29 @@ class WriterAgent:
         self,
         content: PresentationContent,
         session: ClientSession,
-        generated_assets: list[dict] | None = None,
+        generated_assets: list[VisualAsset] | None = None,
         filename: str = "",
     ):
         """
         Assembles the final PPT.
-        generated_assets: List of dicts like [{'slide_number': 0, 'file_path': '...'}]
+        generated_assets: The visual assets produced by the Illustrator, if any.
         """
-        slides_payload = []
+        asset_by_slide = (
+            {a.slide_number: a for a in generated_assets} if generated_assets else {}
+        )
+
+        slides_payload: list[SlidePayload] = []
 
         for i, s in enumerate(content.slides):
-            slide_data = {
-                "title": s.title,
-                "points": s.points,
-                "speaker_notes": s.speaker_notes,
-                "sources": s.sources,
-            }
-            if generated_assets:
-                asset = next((a for a in generated_assets if a["slide_number"] == i), None)
-                if asset:
-                    slide_data["image"] = asset["file_path"]
+            slide_data = SlidePayload(
+                title=s.title,
+                points=s.points,
+                speaker_notes=s.speaker_notes,
+                sources=s.sources,
+            )
+            asset = asset_by_slide.get(i)
+            if asset:
+                slide_data["image"] = asset.file_path
 
             slides_payload.append(slide_data)
 
@@ -119,3 +131,10 @@ class WriterAgent:
             )
 
         return content
+
+
+@functools.lru_cache(maxsize=1)
+def get_writer_agent() -> WriterAgent:
+    """Returns the shared WriterAgent: its OpenAI client (and connection pool)
+    is reused across workflow runs instead of being rebuilt per deck."""
+    return WriterAgent()
@@ -1,3 +1,5 @@
+from typing import NotRequired, TypedDict
+
 from pydantic import BaseModel, Field
 
 
@@ -28,6 +30,21 @@ class SlideContent(BaseModel):
     visual_request: VisualRequest | None = None
 
 
+class SlidePayload(TypedDict):
+    """Shape of the per-slide dict sent to the create_presentation tool.
+
+    A TypedDict rather than a model: the payload is serialized straight to
+    JSON, so this buys schema checking from the type checker without paying
+    pydantic validation on an internal hop.
+    """
+
+    title: str
+    points: list[str]
+    speaker_notes: str | None
+    sources: list[str] | None
+    image: NotRequired[str]
+
+
 class PresentationContent(BaseModel):
     filename_suggestion: str = Field(
         description="A clean, underscore-separated filename (e.g., 'ai_trends_2026')"
@@ -1,31 +1,107 @@
+from copy import deepcopy
+
+from lxml import etree
 from pptx.enum.text import PP_ALIGN
+from pptx.oxml.ns import nsdecls, qn
 
 from core.consts import (
     BODY_FONT_COLOR,
     BODY_FONT_NAME,
     BODY_FONT_SIZE,
+    BODY_LINE_SPACING,
     TITLE_BOLD,
     TITLE_FONT_COLOR,
     TITLE_FONT_NAME,
     TITLE_FONT_SIZE,
 )
 
+# Prebuilt <a:defRPr> subtree for title paragraphs: cloning it once per
+# paragraph replaces the six python-pptx property setters (each of which
+# mutates the OOXML tree through several descriptor layers).
+_TITLE_DEFRPR = etree.fromstring(
+    f'<a:defRPr {nsdecls("a")} sz="{int(TITLE_FONT_SIZE.pt * 100)}" b="{int(TITLE_BOLD)}">'
+    f'<a:solidFill><a:srgbClr val="{TITLE_FONT_COLOR}"/></a:solidFill>'
+    f'<a:latin typeface="{TITLE_FONT_NAME}"/>'
+    "</a:defRPr>"
+)
+
+
+def apply_title_style_fast(title_shape):
+    """Apply the title style by attaching a prebuilt run-properties subtree.
+
+    Equivalent to apply_title_style but bulk-applies the formatting via lxml
+    instead of going through python-pptx's per-attribute setters.
+    """
+    if title_shape is None:
+        return
+
+    for paragraph in title_shape.text_frame.paragraphs:
+        pPr = paragraph._p.get_or_add_pPr()
+        pPr.set("algn", "l")
+        existing = pPr.find(qn("a:defRPr"))
+        if existing is not None:
+            pPr.remove(existing)
+        pPr.append(deepcopy(_TITLE_DEFRPR))
+
 
 def apply_title_style(title_shape):
     """Apply custom styling to the title."""
     if title_shape is None:
         return
 
+    # Each paragraph.font access walks back into the XML tree, so resolve it
+    # once per paragraph (and the constants once per call) instead of per write.
+    name, size, bold, color = TITLE_FONT_NAME, TITLE_FONT_SIZE, TITLE_BOLD, TITLE_FONT_COLOR
     for paragraph in title_shape.text_frame.paragraphs:
-        paragraph.font.name = TITLE_FONT_NAME
-        paragraph.font.size = TITLE_FONT_SIZE
-        paragraph.font.bold = TITLE_BOLD
-        paragraph.font.color.rgb = TITLE_FONT_COLOR
+        font = paragraph.font
+        font.name = name
+        font.size = size
+        font.bold = bold
+        font.color.rgb = color
         paragraph.alignment = PP_ALIGN.LEFT
 
 
 def apply_body_style(paragraph, font_size=None):
     """Apply custom styling to body paragraphs."""
-    paragraph.font.name = BODY_FONT_NAME
-    paragraph.font.size = font_size or BODY_FONT_SIZE
-    paragraph.font.color.rgb = BODY_FONT_COLOR
+    font = paragraph.font
+    font.name = BODY_FONT_NAME
+    font.size = font_size or BODY_FONT_SIZE
+    font.color.rgb = BODY_FONT_COLOR
+
+
+# Prebuilt styled <a:p> for body bullets: add_paragraph + the per-attribute
+# font setters rebuild lxml state for every bullet, which is the hot path on
+# large decks. Cloning this subtree makes each bullet a single tree append.
+_BODY_P_TEMPLATE = etree.fromstring(
+    f'<a:p {nsdecls("a")}>'
+    f'<a:pPr><a:spcBef><a:spcPts val="{int(BODY_LINE_SPACING.pt * 100)}"/></a:spcBef>'
+    f'<a:defRPr sz="{int(BODY_FONT_SIZE.pt * 100)}">'
+    f'<a:solidFill><a:srgbClr val="{BODY_FONT_COLOR}"/></a:solidFill>'
+    f'<a:latin typeface="{BODY_FONT_NAME}"/>'
+    "</a:defRPr></a:pPr>"
+    "<a:r><a:t/></a:r></a:p>"
+)
+
+
+def append_body_paragraphs_fast(text_frame, points, font_size=None):
+    """Fill a body text frame with styled bullet paragraphs.
+
+    The first point reuses the frame's existing paragraph (python-pptx path,
+    so placeholder inheritance stays intact); the rest are cloned from the
+    prebuilt template and appended to the txBody directly.
+    """
+    if not points:
+        return
+
+    first = text_frame.paragraphs[0]
+    first.text = points[0]
+    apply_body_style(first, font_size)
+    first.level = 0
+
+    size_attr = str(int((font_size or BODY_FONT_SIZE).pt * 100))
+    txBody = text_frame._txBody
+    for point in points[1:]:
+        p_el = deepcopy(_BODY_P_TEMPLATE)
+        p_el.find(qn("a:pPr")).find(qn("a:defRPr")).set("sz", size_attr)
+        p_el.find(qn("a:r")).find(qn("a:t")).text = point
+        txBody.append(p_el)
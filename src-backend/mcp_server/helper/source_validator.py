@@ -1,7 +1,15 @@
+import asyncio
+import time
 from urllib.parse import urlparse, urlunparse
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from selectolax.parser import HTMLParser
+
+# Source pages rarely change, so live validations can be trusted for a day;
+# dead/error results are retried sooner since they are often transient.
+VALIDATION_CACHE_TTL_LIVE = 86400  # seconds
+VALIDATION_CACHE_TTL_DEAD = 300  # seconds
+VALIDATION_CACHE_MAX_SIZE = 10_000
 
 
 class SourceValidator:
@@ -9,6 +17,27 @@ class SourceValidator:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        # One pooled client for the validator's lifetime: keep-alive (and HTTP/2
+        # multiplexing) amortizes the TCP+TLS handshake across repeated hosts.
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            headers=self.headers,
+            timeout=5.0,
+            follow_redirects=True,
+        )
+        # Maps normalized URL -> (expiry timestamp, validation result). The same
+        # sources reappear across slides and decks; a warm hit skips the HTTP
+        # fetch and HTML parse entirely.
+        self._validation_cache: dict[str, tuple[float, dict]] = {}
+        # Caps in-flight validations: the pool already limits connections, but
+        # without this a large batch parks every request coroutine on the pool
+        # queue at once (and each holds its response body in memory).
+        self._validation_semaphore = asyncio.Semaphore(20)
+
+    async def close(self) -> None:
+        """Closes the pooled HTTP client and its keep-alive connections."""
+        await self._client.aclose()
 
     def normalize_url(self, url: str) -> str:
         """Removes query parameters (UTM, etc.) and fragments from the URL.
@@ -23,41 +52,41 @@ class SourceValidator:
         clean_url = urlunparse((parsed.scheme, parsed.netloc, parsed.path, "", "", ""))
         return clean_url
 
-    def get_metadata(self, html_soup) -> dict:
-        """Extracts author, date, and reference indicators from the HTML soup.
+    def get_metadata(self, html: str | bytes) -> dict:
+        """Extracts author, date, and reference indicators from the page HTML.
 
         Args:
-            html_soup (BeautifulSoup): The HTML soup to extract metadata from.
+            html (str | bytes): The raw HTML to extract metadata from.
 
         Returns:
             dict: The metadata.
         """
         meta = {"author": None, "date": None, "has_references": False}
+        tree = HTMLParser(html)
 
-        author_tag = html_soup.find("meta", {"name": "author"}) or html_soup.find(
-            "meta", property="article:author"
+        author_tag = tree.css_first('meta[name="author"]') or tree.css_first(
+            'meta[property="article:author"]'
         )
         if author_tag:
-            meta["author"] = author_tag.get("content")
+            meta["author"] = author_tag.attributes.get("content")
 
         date_tag = (
-            html_soup.find("meta", {"name": "date"})
-            or html_soup.find("meta", property="article:published_time")
-            or html_soup.find("time")
+            tree.css_first('meta[name="date"]')
+            or tree.css_first('meta[property="article:published_time"]')
+            or tree.css_first("time")
         )
         if date_tag:
-            meta["date"] = date_tag.get("content") or date_tag.get_text()
+            meta["date"] = date_tag.attributes.get("content") or date_tag.text()
 
-        headers = html_soup.find_all(["h1", "h2", "h3", "h4"])
         ref_keywords = ["references", "bibliography", "works cited", "sources"]
-        for h in headers:
-            if any(k in h.get_text().lower() for k in ref_keywords):
+        for h in tree.css("h1,h2,h3,h4"):
+            if any(k in h.text().lower() for k in ref_keywords):
                 meta["has_references"] = True
                 break
 
         return meta
 
-    def validate_url(self, url: str, tavily_confidence: float) -> dict:
+    async def validate_url(self, url: str, tavily_confidence: float) -> dict:
         """Performs the full health check and scoring.
         Calculates a Hybrid Score with tavily confidence as the base points.
         Args:
@@ -67,64 +96,82 @@ class SourceValidator:
             dict: The validation result.
         """
         clean_url = self.normalize_url(url)
-        base_points = tavily_confidence * 100
-        result = {"url": clean_url, "status": "dead", "score": 0, "tier": "C", "details": {}}
+        now = time.monotonic()
+        cached = self._validation_cache.get(clean_url)
+        if cached is not None and cached[0] > now:
+            return cached[1]
 
+        base_points = tavily_confidence * 100
         result = {"url": clean_url, "status": "dead", "score": 0, "tier": "C", "details": {}}
 
         try:
             # 1. Health Check
-            response = requests.get(clean_url, headers=self.headers, timeout=5)
+            response = await self._client.get(clean_url)
             if response.status_code != 200:
+                # No early return: dead URLs (404s, paywalls) recur heavily in
+                # search results, so the result must reach the cache write
+                # below to be retried only after the dead TTL.
                 result["details"]["error"] = f"Status {response.status_code}"
-                return result
+            else:
+                result["status"] = "live"
+                meta = self.get_metadata(response.content)
+                result["details"] = meta
 
-            result["status"] = "live"
-            soup = BeautifulSoup(response.content, "html.parser")
-            meta = self.get_metadata(soup)
-            result["details"] = meta
+                # 2. Score Calculation
+                final_score = base_points
 
-            # 2. Score Calculation
-            final_score = base_points
+                if meta["author"]:
+                    final_score += 10
+                if meta["date"]:
+                    final_score += 5
 
-            if meta["author"]:
-                final_score += 10
-            if meta["date"]:
-                final_score += 5
+                # Bonuses for Domain Authority
+                domain = urlparse(clean_url).netloc
+                if domain.endswith((".edu", ".gov")):
+                    final_score += 15
 
-            # Bonuses for Domain Authority
-            domain = urlparse(clean_url).netloc
-            if domain.endswith((".edu", ".gov")):
-                final_score += 15
+                result["score"] = min(round(final_score, 2), 100)
 
-            result["score"] = min(round(final_score, 2), 100)
-
-            # 3. Tier Assignment
-            if result["score"] >= 80:
-                result["tier"] = "S"
-            elif result["score"] >= 60:
-                result["tier"] = "A"
-            else:
-                result["tier"] = "B"
+                # 3. Tier Assignment
+                if result["score"] >= 80:
+                    result["tier"] = "S"
+                elif result["score"] >= 60:
+                    result["tier"] = "A"
+                else:
+                    result["tier"] = "B"
 
         except Exception as e:
             result["details"]["error"] = str(e)
 
+        if len(self._validation_cache) >= VALIDATION_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts preserve insertion order).
+            self._validation_cache.pop(next(iter(self._validation_cache)))
+        ttl = (
+            VALIDATION_CACHE_TTL_LIVE if result["status"] == "live" else VALIDATION_CACHE_TTL_DEAD
+        )
+        self._validation_cache[clean_url] = (now + ttl, result)
+
         return result
 
-    def rank_sources(self, raw_results: list[dict]) -> list[dict]:
+    async def rank_sources(self, raw_results: list[dict]) -> list[dict]:
         """
         raw_results must include: {'url': '...', 'score': 0.81, ...}
-        """
-        ranked_results = []
-        for item in raw_results:
-            url = item.get("url", "")
-            t_score = item.get("score", 0.5)  # Default to 0.5 if missing
-
-            validation = self.validate_url(url, tavily_confidence=t_score)
 
-            ranked_item = {**item, "validation": validation}
-            ranked_results.append(ranked_item)
+        Validations run concurrently, so a batch completes in roughly the
+        latency of the slowest URL instead of the sum of all of them.
+        """
+        async def validate_bounded(item: dict) -> dict:
+            async with self._validation_semaphore:
+                return await self.validate_url(
+                    item.get("url", ""), tavily_confidence=item.get("score", 0.5)
+                )
+
+        validations = await asyncio.gather(*[validate_bounded(item) for item in raw_results])
+
+        ranked_results = [
+            {**item, "validation": validation}
+            for item, validation in zip(raw_results, validations, strict=True)
+        ]
 
         # Sort by Final Score (High to Low)
         return sorted(ranked_results, key=lambda x: x["validation"]["score"], reverse=True)
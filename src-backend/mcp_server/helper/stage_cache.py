@@ -0,0 +1,48 @@
+import hashlib
+
+import orjson
+
+from core.logger_config import logger
+
+STAGE_CACHE_MAX_SIZE = 256
+
+
+class StageCache:
+    """In-process memo of agent stage results, keyed by a content hash.
+
+    Re-running the same topic (common during development and in retry loops)
+    replays every LLM and Tavily call even though the inputs are identical.
+    Each stage stores its serialized result under a blake2b hash of
+    (agent name, model, inputs); the model name in the key means a model or
+    prompt-config change naturally invalidates old entries.
+    """
+
+    def __init__(self):
+        self._cache: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts: str | int | dict | list) -> str:
+        """Builds a cache key from JSON-serializable stage inputs."""
+        raw = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached serialized result for the key, if any."""
+        result = self._cache.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            logger.debug("Stage cache hit", key=key, hits=self.hits, misses=self.misses)
+        return result
+
+    def put(self, key: str, serialized: str) -> None:
+        """Stores a serialized stage result, evicting oldest entries when full."""
+        if len(self._cache) >= STAGE_CACHE_MAX_SIZE:
+            for old_key in list(self._cache)[: STAGE_CACHE_MAX_SIZE // 10]:
+                del self._cache[old_key]
+        self._cache[key] = serialized
+
+
+stage_cache = StageCache()
@@ -1,18 +1,21 @@
-import json
+import asyncio
+import base64
+import io
 import os
 from datetime import datetime
+from pathlib import Path
 from typing import Literal
 
-import numpy as np
-from matplotlib import pyplot as plt
+import orjson
+import pptx
 from mcp.server.fastmcp import FastMCP
 from pptx import Presentation
 from pptx.util import Inches
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from tavily import TavilyClient
 
 from core.consts import (
     BODY_FONT_SIZE,
-    BODY_LINE_SPACING,
     DOMAIN_BLACKLIST,
     FILE_PATH,
     IMAGE_HEIGHT,
@@ -21,19 +24,43 @@ from core.consts import (
 )
 from core.logger_config import logger
 from core.settings import settings
-from mcp_server.helper.ppt_style import apply_body_style, apply_title_style
+from mcp_server.helper.ppt_style import append_body_paragraphs_fast, apply_title_style_fast
 from mcp_server.helper.source_validator import source_validator
 
 mcp_server = FastMCP("PPT-Generator-Tools")
 
 tavily_client = TavilyClient(api_key=settings.TAVILY_API_KEY)
 
+# Presentation() re-reads and re-parses the default template zip from disk on
+# every call; cache its bytes once so each deck starts from an in-memory copy.
+_TEMPLATE_BYTES = (Path(pptx.__file__).parent / "templates" / "default.pptx").read_bytes()
+
+
+def _new_presentation():
+    """Returns a fresh Presentation built from the cached default template."""
+    return Presentation(io.BytesIO(_TEMPLATE_BYTES))
+
+
+class SlideInput(BaseModel):
+    """Schema for one slide in the create_presentation payload."""
+
+    title: str = "No Title"
+    points: list[str] = []
+    speaker_notes: str | None = ""
+    sources: list[str] | None = []
+    image: str | None = None
+
+
+# Validating up front means malformed payloads are rejected before any
+# template parsing or slide assembly work happens.
+_SLIDES_ADAPTER = TypeAdapter(list[SlideInput])
+
 
 @mcp_server.tool(
     name="search_web",
     description="Search the web for information",
 )
-def search_web(query: str, search_depth: Literal["basic", "advanced"] = "advanced") -> str:
+async def search_web(query: str, search_depth: Literal["basic", "advanced"] = "advanced") -> str:
     """Search the web for information based on the given query.
 
     Args:
@@ -44,7 +71,11 @@ def search_web(query: str, search_depth: Literal["basic", "advanced"] = "advance
     """
     logger.info("Searching the web for information...")
     try:
-        response = tavily_client.search(
+        # TavilyClient.search is a synchronous HTTP call; run it in a worker
+        # thread so it doesn't block the server loop and serialize the
+        # per-query fan-out the researcher issues over this session.
+        response = await asyncio.to_thread(
+            tavily_client.search,
             query=query,
             search_depth=search_depth,
             max_results=10,
@@ -54,15 +85,15 @@ def search_web(query: str, search_depth: Literal["basic", "advanced"] = "advance
 
         context = [{"content": r["content"], "url": r["url"]} for r in response.get("results", [])]
         logger.info(f"Context: {context}")
-        ranked_results = source_validator.rank_sources(context)
+        ranked_results = await source_validator.rank_sources(context)
         high_quality_results = [
             res for res in ranked_results if res["validation"]["tier"] in ["S", "A"]
         ]
         if not high_quality_results:
             logger.warning(f"No Tier S/A results found for '{query}'. Returning empty list.")
-            return json.dumps([])
+            return "[]"
         logger.info(f"Returning {len(high_quality_results)} high-quality results for '{query}'")
-        return json.dumps(high_quality_results, indent=2)
+        return orjson.dumps(high_quality_results, option=orjson.OPT_INDENT_2).decode()
     except Exception as e:
         return f"Error searching web: {str(e)}"
 
@@ -82,107 +113,152 @@ def create_presentation(filename: str, slides_content: str) -> str:
         str: The message indicating the success or failure of the operation.
     """
     try:
-        data = json.loads(slides_content)
-
-        prs = Presentation()
-
-        for slide_data in data:
-            image_path = slide_data.get("image")
-            has_image = image_path and os.path.exists(image_path)
-
-            if has_image:
-                blank_idx = min(6, len(prs.slide_layouts) - 1)
-                slide_layout = prs.slide_layouts[blank_idx]
-                for layout in prs.slide_layouts:
-                    if "blank" in layout.name.lower():
-                        slide_layout = layout
-                        break
-            else:
-                slide_layout = prs.slide_layouts[0]
-                for layout in prs.slide_layouts:
-                    layout_name = layout.name.lower()
-                    if "content" in layout_name or "text" in layout_name:
-                        slide_layout = layout
-                        break
-                    if "title" in layout_name and "only" not in layout_name:
-                        slide_layout = layout
-
-            slide = prs.slides.add_slide(slide_layout)
-            title = slide.shapes.title
-            if title:
-                title.text = slide_data.get("title", "No Title")
-                apply_title_style(title)
-
-            if not has_image:
-                # -- Title --
-
-                # -- Body --
-                body_shape = None
-                for shape in slide.placeholders:
-                    if hasattr(shape, "placeholder_format") and shape.placeholder_format.idx == 1:
-                        body_shape = shape
-                        break
-
-                if body_shape is None:
-                    placeholders = list(slide.placeholders)
-                    if len(placeholders) > 1:
-                        body_shape = placeholders[1]
-
-                if body_shape:
-                    tf = body_shape.text_frame  # pyright: ignore[reportAttributeAccessIssue]
-                    tf.word_wrap = True
-                    font_size = BODY_FONT_SIZE
-                    points = slide_data.get("points", [])
-
-                    if points:
-                        tf.paragraphs[0].text = points[0]
-                        apply_body_style(tf.paragraphs[0], font_size)
-                        tf.paragraphs[0].level = 0
-
-                        for point in points[1:]:
-                            p = tf.add_paragraph()
-                            p.text = point
-                            apply_body_style(p, font_size)
-                            p.level = 0
-                            p.space_before = BODY_LINE_SPACING
-
-            # -- Speaker Notes & Sources --
-            speaker_notes = slide_data.get("speaker_notes", "")
-            sources = slide_data.get("sources", [])
-            if speaker_notes or sources:
-                notes_slide = slide.notes_slide
-                text_frame = notes_slide.notes_text_frame
-                content = speaker_notes if speaker_notes else ""
-
-                if sources:
-                    if content:
-                        content += "\n\n"
-                    content += "Sources:\n" + "\n".join(f"- {url}" for url in sources)
-                if text_frame:
-                    text_frame.text = content
-
-            # -- Image --
-            if has_image:
-                try:
-                    picture = slide.shapes.add_picture(
-                        image_path,
-                        left=Inches(0),
-                        top=Inches(0),
-                        height=IMAGE_HEIGHT,
-                    )
-                    picture.left = (SLIDE_WIDTH - picture.width) // 2
-                    picture.top = (SLIDE_HEIGHT - picture.height) // 2
-                except Exception as e:
-                    logger.warning(f"Could not add image {image_path}: {e}")
+        slides = _SLIDES_ADAPTER.validate_json(slides_content)
+    except ValidationError as e:
+        return f"Error creating PPT: invalid slides_content: {e}"
+
+    try:
+        buffer = _build_presentation(slides)
 
         path = FILE_PATH / f"{filename}.pptx"
         path.parent.mkdir(parents=True, exist_ok=True)
-        prs.save(str(path.resolve()))
+        # Write the in-memory package in one pass and publish atomically so
+        # download_ppt never sees a partially written file.
+        tmp_path = path.with_suffix(".pptx.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp_path, path)
         return f"Successfully saved presentation to {path}"
     except Exception as e:
         return f"Error creating PPT: {str(e)}"
 
 
+@mcp_server.tool(
+    name="create_presentation_bytes",
+    description="Create a PowerPoint presentation and return it as base64 bytes.",
+)
+def create_presentation_bytes(slides_content: str) -> str:
+    """Create a presentation entirely in memory and return it base64-encoded.
+
+    Lets clients that only forward the deck onward skip the shared
+    filesystem round-trip that create_presentation pays.
+
+    Args:
+        slides_content (str): The slides content of the presentation.
+
+    Returns:
+        str: The base64-encoded pptx bytes, or an error message.
+    """
+    try:
+        slides = _SLIDES_ADAPTER.validate_json(slides_content)
+    except ValidationError as e:
+        return f"Error creating PPT: invalid slides_content: {e}"
+
+    try:
+        buffer = _build_presentation(slides)
+        return base64.b64encode(buffer.getbuffer()).decode()
+    except Exception as e:
+        return f"Error creating PPT: {str(e)}"
+
+
+def _build_presentation(slides: list[SlideInput]) -> io.BytesIO:
+    """Assembles the deck for the given slide payloads into an in-memory buffer."""
+    prs = _new_presentation()
+
+    # One directory listing answers the existence check for every chart
+    # image, instead of a stat() syscall per slide.
+    charts_dir = str(FILE_PATH / "charts")
+    try:
+        existing_charts = {entry.name for entry in os.scandir(charts_dir)}
+    except FileNotFoundError:
+        existing_charts = set()
+
+    # The layout searches are loop-invariant: resolve the image (blank) and
+    # text (content) layouts once for the whole deck.
+    blank_idx = min(6, len(prs.slide_layouts) - 1)
+    image_layout = prs.slide_layouts[blank_idx]
+    for layout in prs.slide_layouts:
+        if "blank" in layout.name.lower():
+            image_layout = layout
+            break
+
+    text_layout = prs.slide_layouts[0]
+    for layout in prs.slide_layouts:
+        layout_name = layout.name.lower()
+        if "content" in layout_name or "text" in layout_name:
+            text_layout = layout
+            break
+        if "title" in layout_name and "only" not in layout_name:
+            text_layout = layout
+
+    for slide_data in slides:
+        image_path = slide_data.image
+        if image_path and os.path.dirname(image_path) == charts_dir:
+            has_image = os.path.basename(image_path) in existing_charts
+        else:
+            # Paths outside the charts directory still need a direct check.
+            has_image = bool(image_path) and os.path.exists(image_path)
+
+        slide = prs.slides.add_slide(image_layout if has_image else text_layout)
+        title = slide.shapes.title
+        if title:
+            title.text = slide_data.title
+            apply_title_style_fast(title)
+
+        if not has_image:
+            # -- Title --
+
+            # -- Body --
+            body_shape = None
+            for shape in slide.placeholders:
+                if hasattr(shape, "placeholder_format") and shape.placeholder_format.idx == 1:
+                    body_shape = shape
+                    break
+
+            if body_shape is None:
+                placeholders = list(slide.placeholders)
+                if len(placeholders) > 1:
+                    body_shape = placeholders[1]
+
+            if body_shape:
+                tf = body_shape.text_frame  # pyright: ignore[reportAttributeAccessIssue]
+                tf.word_wrap = True
+                append_body_paragraphs_fast(tf, slide_data.points, BODY_FONT_SIZE)
+
+        # -- Speaker Notes & Sources --
+        speaker_notes = slide_data.speaker_notes
+        sources = slide_data.sources
+        if speaker_notes or sources:
+            notes_slide = slide.notes_slide
+            text_frame = notes_slide.notes_text_frame
+            content = speaker_notes if speaker_notes else ""
+
+            if sources:
+                if content:
+                    content += "\n\n"
+                content += "Sources:\n" + "\n".join(f"- {url}" for url in sources)
+            if text_frame:
+                text_frame.text = content
+
+        # -- Image --
+        if has_image:
+            try:
+                picture = slide.shapes.add_picture(
+                    image_path,
+                    left=Inches(0),
+                    top=Inches(0),
+                    height=IMAGE_HEIGHT,
+                )
+                picture.left = (SLIDE_WIDTH - picture.width) // 2
+                picture.top = (SLIDE_HEIGHT - picture.height) // 2
+            except Exception as e:
+                logger.warning(f"Could not add image {image_path}: {e}")
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer
+
+
 @mcp_server.tool(
     name="generate_chart",
     description="Generate visual assets for the presentation.",
@@ -203,8 +279,17 @@ def generate_chart(data_json: str, chart_type: str, title: str) -> str:
     logger.info(
         f"Generate Visual Assets Tool was triggered with data_json: {data_json}, chart_type: {chart_type}, title: {title}"
     )
+    # Imported lazily: matplotlib pulls in numpy and a font-cache scan that
+    # would otherwise tax every MCP server start, chart or no chart. The Agg
+    # backend skips any GUI toolkit probing since we only ever write PNGs.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import numpy as np
+    from matplotlib import pyplot as plt
+
     try:
-        data = json.loads(data_json)
+        data = orjson.loads(data_json)
         labels = data.get("labels", [])
         values = data.get("values", [])
         unit = data.get("unit", "Values")
@@ -254,7 +339,7 @@ def generate_chart(data_json: str, chart_type: str, title: str) -> str:
 
         return str(path)
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return "Error: Invalid JSON string provided."
     except Exception as e:
         return f"Error generating chart: {str(e)}"
@@ -1,22 +1,126 @@
-import json
+import asyncio
 import os
 
+from aiolimiter import AsyncLimiter
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
 from core.consts import FILE_PATH
 from core.logger_config import logger
-from mcp_server.agents.illustrator.agent import IllustratorAgent
+from mcp_server.agents.illustrator.agent import get_illustrator_agent
+from mcp_server.agents.illustrator.schemas import VisualRequestPayload
 
 # Import your 4 Agents
-from mcp_server.agents.planner.agent import PlannerAgent
-from mcp_server.agents.planner.schemas import PresentationPayload
-from mcp_server.agents.researcher.agent import ResearcherAgent
-from mcp_server.agents.researcher.schemas import ResearcherPayload
-from mcp_server.agents.writer.agent import WriterAgent
+from mcp_server.agents.planner.agent import get_planner_agent
+from mcp_server.agents.planner.schemas import PresentationPayload, PresentationPlan
+from mcp_server.agents.researcher.agent import get_researcher_agent
+from mcp_server.agents.researcher.schemas import ResearcherPayload, ResearchSummary
+from mcp_server.agents.writer.agent import get_writer_agent
+from mcp_server.agents.writer.schemas import PresentationContent
+from mcp_server.helper.stage_cache import stage_cache
 
 MCP_SERVER_SCRIPT = "mcp_server/mcp_server.py"
 
+# Bounded concurrency for the LLM and search/scraping call sites: enough
+# overlap to hide network latency without tripping provider rate limits.
+LLM_SEMAPHORE = asyncio.Semaphore(int(os.getenv("LLM_CONCURRENCY", "4")))
+SEARCH_SEMAPHORE = asyncio.Semaphore(int(os.getenv("SEARCH_CONCURRENCY", "8")))
+
+# Proactive token buckets sized to the provider request-per-minute ceilings:
+# the fan-outs dispatch at a steady rate below the limit instead of bursting,
+# hitting 429s, and losing the gained time to exponential backoff.
+OPENAI_LIMITER = AsyncLimiter(int(os.getenv("OPENAI_RPM", "60")), time_period=60)
+TAVILY_LIMITER = AsyncLimiter(int(os.getenv("TAVILY_RPM", "100")), time_period=60)
+
+# One MCP server subprocess per backend process: spawning a Python interpreter
+# and replaying initialize/list_tools for every deck dominates short-workflow
+# latency, so the session is opened lazily on first use and shared after that.
+# A dedicated owner task enters and exits the stdio/session contexts, because
+# anyio cancel scopes must be exited in the task that entered them — opening
+# in a request task and closing from the lifespan task raises at shutdown.
+_session: ClientSession | None = None
+_session_task: asyncio.Task | None = None
+_session_ready: asyncio.Event | None = None
+_session_close: asyncio.Event | None = None
+_session_lock = asyncio.Lock()
+
+
+async def _session_owner(ready: asyncio.Event, close: asyncio.Event) -> None:
+    """Holds the MCP session contexts open until asked to close."""
+    global _session
+    # Whitelist instead of copying the whole environment: the server only
+    # needs the API keys, its logging config, and enough to locate the
+    # interpreter and packages. (env=None would use the MCP default
+    # environment, which strips the keys.)
+    server_params = StdioServerParameters(
+        command="python",
+        args=["-m", "mcp_server.mcp_server"],
+        env={
+            k: os.environ[k]
+            for k in (
+                "OPENAI_API_KEY",
+                "TAVILY_API_KEY",
+                "LOG_LEVEL",
+                "PATH",
+                "HOME",
+                "PYTHONPATH",
+            )
+            if k in os.environ
+        },
+    )
+    try:
+        async with stdio_client(server_params) as (read, write):  # noqa: SIM117
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                tools = await session.list_tools()
+                logger.info(f"MCP Connected. Tools: {[t.name for t in tools.tools]}")
+
+                _session = session
+                ready.set()
+                await close.wait()
+    finally:
+        _session = None
+        # Wake any waiter even if startup failed; it will see _session is None.
+        ready.set()
+
+
+async def get_mcp_session() -> ClientSession:
+    """Returns the shared MCP client session, starting the server if needed."""
+    global _session_task, _session_ready, _session_close
+    async with _session_lock:
+        # A finished owner task means the server died or failed to start;
+        # drop it so this call spawns a fresh one instead of staying broken.
+        if _session_task is not None and _session_task.done():
+            _session_task = None
+        if _session_task is None:
+            _session_ready = asyncio.Event()
+            _session_close = asyncio.Event()
+            _session_task = asyncio.create_task(
+                _session_owner(_session_ready, _session_close)
+            )
+        await _session_ready.wait()
+        if _session is None:
+            task, _session_task = _session_task, None
+            await task  # re-raises the owner's startup failure
+            raise RuntimeError("MCP session closed before it became ready")
+        return _session
+
+
+async def close_mcp_session() -> None:
+    """Shuts down the shared MCP session and its server subprocess."""
+    global _session_task
+    async with _session_lock:
+        if _session_task is not None:
+            task, _session_task = _session_task, None
+            _session_close.set()
+            try:
+                await task
+            except Exception as e:
+                # The session is gone either way; a dying subprocess must not
+                # turn shutdown (or a post-failure reset) into a crash.
+                logger.warning(f"MCP session closed with error: {e}")
+
 
 async def run_ppt_workflow(topic: str, num_slides: int, filename: str):
     """
@@ -29,98 +133,116 @@ async def run_ppt_workflow(topic: str, num_slides: int, filename: str):
     """
     logger.info(f"STARTING WORKFLOW: '{topic}' ({num_slides} slides)")
 
-    # 1. Start MCP Server Connection
-    server_params = StdioServerParameters(
-        command="python",
-        args=["-m", "mcp_server.mcp_server"],
-        env=dict(os.environ),
-    )
-
-    async with stdio_client(server_params) as (read, write):  # noqa: SIM117
-        async with ClientSession(read, write) as session:
-            await session.initialize()
+    session = await get_mcp_session()
 
-            tools = await session.list_tools()
-            logger.info(f"MCP Connected. Tools: {[t.name for t in tools.tools]}")
+    # Shared, process-wide agents: each holds an AsyncOpenAI client whose
+    # connection pool is reused across workflow runs.
+    planner = get_planner_agent()
+    researcher = get_researcher_agent()
+    writer = get_writer_agent()
+    illustrator = get_illustrator_agent()
 
-            planner = PlannerAgent()
-            researcher = ResearcherAgent()
-            writer = WriterAgent()
-            illustrator = IllustratorAgent()
+    # --- STEP 1: PLANNER ---
 
-            # --- STEP 1: PLANNER ---
-
-            logger.info("Step 1: Planning the presentation structure...")
+    logger.info("Step 1: Planning the presentation structure...")
+    plan_key = stage_cache.key("planner", planner.model, topic, num_slides)
+    cached_plan = stage_cache.get(plan_key)
+    if cached_plan is not None:
+        plan = PresentationPlan.model_validate_json(cached_plan)
+    else:
+        async with LLM_SEMAPHORE, OPENAI_LIMITER:
             plan = await planner.create_presentation_plan(
                 payload=PresentationPayload(topic=topic, num_slides=num_slides)
             )
-            logger.info(f"Presentation plan created with {len(plan.slides)} slides.")
-            logger.info(f"Presentation plan: {plan.model_dump_json()}")
-            # --- STEP 2: RESEARCHER ---
-
-            logger.info("Step 2: Researching the web for information...")
-            research_data = []
-            for slide in plan.slides:
-                summary = await researcher.research_web(
-                    payload=ResearcherPayload(
-                        slide_title=slide.title, search_queries=slide.search_queries
-                    ),
-                    session=session,
-                )
-                research_data.append(summary.model_dump())
-            logger.info(
-                f"Research completed successfully. Research data: {json.dumps(research_data, indent=2, ensure_ascii=False)}"
+        stage_cache.put(plan_key, plan.model_dump_json())
+    logger.info(f"Presentation plan created with {len(plan.slides)} slides.")
+    # Keyword payloads are only rendered when DEBUG is enabled, so the
+    # full plan serialization is skipped on INFO-level runs.
+    logger.debug("Presentation plan", plan=plan)
+    # --- STEP 2: RESEARCHER ---
+
+    logger.info("Step 2: Researching the web for information...")
+
+    async def research_slide(slide):
+        payload = ResearcherPayload(
+            slide_title=slide.title, search_queries=slide.search_queries
+        )
+        research_key = stage_cache.key(
+            "researcher", researcher.model, payload.model_dump()
+        )
+        cached_summary = stage_cache.get(research_key)
+        if cached_summary is not None:
+            return ResearchSummary.model_validate_json(cached_summary)
+        # The per-slide acquisition covers the one summarization call; Tavily
+        # tokens are debited per query inside research_web, since one slide
+        # fans out a search call per query.
+        async with SEARCH_SEMAPHORE, OPENAI_LIMITER:
+            summary = await researcher.research_web(
+                payload=payload, session=session, search_limiter=TAVILY_LIMITER
             )
-
-            # --- STEP 3: WRITER ---
-
-            logger.info("Step 3: Writing & Designing the presentation...")
+        stage_cache.put(research_key, summary.model_dump_json())
+        return summary
+
+    # Each slide's research is independent, and the MCP session
+    # multiplexes tool calls over one pipe, so the whole fan-out takes
+    # roughly the latency of the slowest slide. gather preserves order.
+    summaries = await asyncio.gather(
+        *[research_slide(slide) for slide in plan.slides]
+    )
+    logger.info("Research completed successfully.")
+    logger.debug("Research data", research_data=summaries)
+
+    # --- STEP 3: WRITER ---
+
+    logger.info("Step 3: Writing & Designing the presentation...")
+    writer_key = stage_cache.key(
+        "writer",
+        writer.model,
+        topic,
+        plan.model_dump(),
+        [summary.model_dump() for summary in summaries],
+    )
+    cached_deck = stage_cache.get(writer_key)
+    if cached_deck is not None:
+        deck_content = PresentationContent.model_validate_json(cached_deck)
+    else:
+        async with LLM_SEMAPHORE, OPENAI_LIMITER:
+            # Pass the models straight through: the writer serializes
+            # them once for its prompt, with no dict round-trip.
             deck_content = await writer.prepare_presentation(
-                topic=topic, plan_json=plan.model_dump(), research_data=research_data
+                topic=topic, plan=plan, research=list(summaries)
             )
-
-            # --- STEP 4: ILLUSTRATOR ---
-
-            logger.info("Step 4: Illustrating...")
-
-            visual_requests = []
-            for i, slide in enumerate(deck_content.slides):
-                if slide.visual_request:
-                    req = slide.visual_request.model_dump()
-                    req["slide_number"] = i
-                    visual_requests.append(req)
-
-            illustration_result = await illustrator.create_visuals(visual_requests, session)
-
-            generated_assets = [asset.model_dump() for asset in illustration_result.assets]
-            # --- STEP 5: ASSEMBLY ---
-            logger.info("Step 5: Assembling Final File...")
-
-            final_slides_payload = []
-            for i, slide in enumerate(deck_content.slides):
-                slide_data = {
-                    "title": slide.title,
-                    "points": slide.points,
-                    "image": None,
-                }
-
-                matching_asset = next(
-                    (a for a in illustration_result.assets if a.slide_number == i), None
+        stage_cache.put(writer_key, deck_content.model_dump_json())
+
+    # --- STEP 4: ILLUSTRATOR ---
+
+    logger.info("Step 4: Illustrating...")
+
+    visual_requests: list[VisualRequestPayload] = []
+    for i, slide in enumerate(deck_content.slides):
+        if slide.visual_request:
+            vr = slide.visual_request
+            visual_requests.append(
+                VisualRequestPayload(
+                    slide_number=i,
+                    type=vr.type,
+                    prompt=vr.prompt,
+                    data_json=vr.data_json.model_dump() if vr.data_json else None,
                 )
-                if matching_asset:
-                    slide_data["image"] = matching_asset.file_path
+            )
 
-                final_slides_payload.append(slide_data)
+    illustration_result = await illustrator.create_visuals(visual_requests, session)
 
-            await writer.write_presentation(
-                content=deck_content,
-                session=session,
-                generated_assets=generated_assets,
-                filename=filename,
-            )
+    # --- STEP 5: ASSEMBLY ---
+    logger.info("Step 5: Assembling Final File...")
 
-            final_filename = f"{filename}.pptx"
-            logger.info(
-                f"DONE! Presentation saved as: {FILE_PATH}/{filename}.pptx"
-            )
-            return final_filename
+    await writer.write_presentation(
+        content=deck_content,
+        session=session,
+        generated_assets=illustration_result.assets,
+        filename=filename,
+    )
+
+    final_filename = f"{filename}.pptx"
+    logger.info(f"DONE! Presentation saved as: {FILE_PATH / final_filename}")
+    return final_filename
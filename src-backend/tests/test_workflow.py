@@ -5,17 +5,32 @@ from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from pptx import Presentation as PptxPresentation
 
+from app.routes.presentation.router import presentation_router
+from mcp_server.agents.illustrator.agent import IllustratorAgent
+from mcp_server.agents.planner.agent import PlannerAgent
+from mcp_server.agents.planner.schemas import PresentationPayload, PresentationPlan, SlidePlan
+from mcp_server.agents.researcher.agent import ResearcherAgent
+from mcp_server.agents.researcher.schemas import Fact, ResearcherPayload, ResearchSummary
+from mcp_server.agents.writer.agent import WriterAgent
+from mcp_server.agents.writer.schemas import (
+    ChartData,
+    PresentationContent,
+    SlideContent,
+    VisualRequest,
+)
+from mcp_server.helper.source_validator import SourceValidator
+from mcp_server.mcp_server import create_presentation, generate_chart, search_web
+
 
 class TestSourceValidator:
     """Tests for SourceValidator helper."""
 
     def test_normalize_url_removes_query_params(self):
         """Test URL normalization removes query parameters."""
-        from mcp_server.helper.source_validator import SourceValidator
-
         validator = SourceValidator()
         url = "https://example.com/article?utm_source=google&ref=123"
         normalized = validator.normalize_url(url)
@@ -23,89 +38,93 @@ class TestSourceValidator:
 
     def test_get_metadata_extracts_author(self):
         """Test metadata extraction for author."""
-        from bs4 import BeautifulSoup
-
-        from mcp_server.helper.source_validator import SourceValidator
-
         validator = SourceValidator()
         html = '<html><head><meta name="author" content="John Doe"></head></html>'
-        soup = BeautifulSoup(html, "html.parser")
-        meta = validator.get_metadata(soup)
+        meta = validator.get_metadata(html)
         assert meta["author"] == "John Doe"
 
     def test_get_metadata_extracts_date(self):
         """Test metadata extraction for date."""
-        from bs4 import BeautifulSoup
-
-        from mcp_server.helper.source_validator import SourceValidator
-
         validator = SourceValidator()
         html = '<html><head><meta name="date" content="2026-01-30"></head><body><h2>References</h2><p>Source list</p></body></html>'
-        soup = BeautifulSoup(html, "html.parser")
-        meta = validator.get_metadata(soup)
+        meta = validator.get_metadata(html)
         assert meta["date"] == "2026-01-30"
         assert meta["has_references"] is True
 
-    @patch("mcp_server.helper.source_validator.requests.get")
-    def test_validate_url_live_site(self, mock_get):
+    @pytest.mark.asyncio
+    async def test_validate_url_live_site(self):
         """Test URL validation for a live site."""
-        from mcp_server.helper.source_validator import SourceValidator
-
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.content = b"<html><head><meta name='author' content='Test'></head></html>"
-        mock_get.return_value = mock_response
 
         validator = SourceValidator()
-        result = validator.validate_url("https://example.com", tavily_confidence=0.8)
+        validator._client = AsyncMock()
+        validator._client.get.return_value = mock_response
+        result = await validator.validate_url("https://example.com", tavily_confidence=0.8)
 
         assert result["status"] == "live"
         assert result["score"] > 0
         assert result["tier"] in ["S", "A", "B"]
 
-    @patch("mcp_server.helper.source_validator.requests.get")
-    def test_validate_url_dead_site(self, mock_get):
+    @pytest.mark.asyncio
+    async def test_validate_url_dead_site(self):
         """Test URL validation for a dead site."""
-        from mcp_server.helper.source_validator import SourceValidator
-
         mock_response = MagicMock()
         mock_response.status_code = 404
-        mock_get.return_value = mock_response
 
         validator = SourceValidator()
-        result = validator.validate_url("https://example.com/404", tavily_confidence=0.8)
+        validator._client = AsyncMock()
+        validator._client.get.return_value = mock_response
+        result = await validator.validate_url("https://example.com/404", tavily_confidence=0.8)
 
         assert result["status"] == "dead"
         assert result["tier"] == "C"
 
 
+@pytest.fixture(scope="module")
+def plan_3slides():
+    """A valid 3-slide plan, built once per module to amortize validation."""
+    return PresentationPlan(
+        topic="Test Topic",
+        slides=[
+            SlidePlan(
+                slide_number=i,
+                title=f"Slide {i}",
+                search_queries=[f"query{i}"],
+                content_goal=f"Goal {i}",
+            )
+            for i in range(3)
+        ],
+    )
+
+
+@pytest.fixture(scope="module")
+def plan_2slides():
+    """A valid 2-slide plan for the retry tests."""
+    return PresentationPlan(
+        topic="Test",
+        slides=[
+            SlidePlan(
+                slide_number=i,
+                title=f"Slide {i}",
+                search_queries=["q"],
+                content_goal="Goal",
+            )
+            for i in range(2)
+        ],
+    )
+
+
 class TestPlannerAgent:
     """Tests for PlannerAgent."""
 
     @pytest.mark.asyncio
-    async def test_create_presentation_plan_success(self):
+    async def test_create_presentation_plan_success(self, plan_3slides):
         """Test successful presentation plan creation."""
-        from mcp_server.agents.planner.agent import PlannerAgent
-        from mcp_server.agents.planner.schemas import (
-            PresentationPayload,
-            PresentationPlan,
-            SlidePlan,
-        )
-
         agent = PlannerAgent()
 
-        mock_plan = PresentationPlan(
-            topic="Test Topic",
-            slides=[
-                SlidePlan(
-                    slide_number=i,
-                    title=f"Slide {i}",
-                    search_queries=[f"query{i}"],
-                    content_goal=f"Goal {i}",
-                )
-                for i in range(3)
-            ],
-        )
+        mock_plan = plan_3slides
 
         mock_response = MagicMock()
         mock_response.choices = [MagicMock(message=MagicMock(parsed=mock_plan))]
@@ -123,30 +142,12 @@ class TestPlannerAgent:
             mock_parse.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_validate_response_retries_on_none(self):
+    async def test_validate_response_retries_on_none(self, plan_2slides):
         """Test validation retries when response is None."""
-        from mcp_server.agents.planner.agent import PlannerAgent
-        from mcp_server.agents.planner.schemas import (
-            PresentationPayload,
-            PresentationPlan,
-            SlidePlan,
-        )
-
         agent = PlannerAgent()
         payload = PresentationPayload(topic="Test", num_slides=2)
 
-        valid_plan = PresentationPlan(
-            topic="Test",
-            slides=[
-                SlidePlan(
-                    slide_number=i,
-                    title=f"Slide {i}",
-                    search_queries=["q"],
-                    content_goal="Goal",
-                )
-                for i in range(2)
-            ],
-        )
+        valid_plan = plan_2slides
 
         mock_responses = [
             MagicMock(choices=[MagicMock(message=MagicMock(parsed=None))]),
@@ -169,9 +170,6 @@ class TestResearcherAgent:
     @pytest.mark.asyncio
     async def test_research_web_empty_results(self):
         """Test research_web handles empty results."""
-        from mcp_server.agents.researcher.agent import ResearcherAgent
-        from mcp_server.agents.researcher.schemas import ResearcherPayload
-
         agent = ResearcherAgent()
         mock_session = AsyncMock()
 
@@ -189,9 +187,6 @@ class TestResearcherAgent:
     @pytest.mark.asyncio
     async def test_summarize_facts_success(self):
         """Test successful fact summarization."""
-        from mcp_server.agents.researcher.agent import ResearcherAgent
-        from mcp_server.agents.researcher.schemas import Fact, ResearchSummary
-
         agent = ResearcherAgent()
 
         mock_summary = ResearchSummary(
@@ -223,14 +218,6 @@ class TestWriterAgent:
     @pytest.mark.asyncio
     async def test_prepare_presentation_success(self):
         """Test successful presentation preparation."""
-        from mcp_server.agents.writer.agent import WriterAgent
-        from mcp_server.agents.writer.schemas import (
-            ChartData,
-            PresentationContent,
-            SlideContent,
-            VisualRequest,
-        )
-
         agent = WriterAgent()
 
         mock_content = PresentationContent(
@@ -260,8 +247,8 @@ class TestWriterAgent:
 
             result = await agent.prepare_presentation(
                 topic="Test",
-                plan_json={"topic": "Test", "slides": []},
-                research_data=[],
+                plan=PresentationPlan(topic="Test", slides=[]),
+                research=[],
             )
 
             assert result.filename_suggestion == "test_presentation"
@@ -270,12 +257,6 @@ class TestWriterAgent:
     @pytest.mark.asyncio
     async def test_write_presentation_calls_mcp_tool(self):
         """Test write_presentation calls the MCP tool correctly."""
-        from mcp_server.agents.writer.agent import WriterAgent
-        from mcp_server.agents.writer.schemas import (
-            PresentationContent,
-            SlideContent,
-        )
-
         agent = WriterAgent()
         mock_session = AsyncMock()
 
@@ -313,12 +294,6 @@ class TestWriterAgent:
     @pytest.mark.asyncio
     async def test_validate_response_requires_chart(self):
         """Test validation requires at least one chart."""
-        from mcp_server.agents.writer.agent import WriterAgent
-        from mcp_server.agents.writer.schemas import (
-            PresentationContent,
-            SlideContent,
-        )
-
         agent = WriterAgent()
         agent.retry_count = 3
 
@@ -345,8 +320,6 @@ class TestIllustratorAgent:
     @pytest.mark.asyncio
     async def test_create_visuals_chart(self):
         """Test creating chart visuals."""
-        from mcp_server.agents.illustrator.agent import IllustratorAgent
-
         agent = IllustratorAgent()
         mock_session = AsyncMock()
 
@@ -373,8 +346,6 @@ class TestIllustratorAgent:
     @pytest.mark.asyncio
     async def test_create_visuals_handles_exception(self):
         """Test create_visuals handles exceptions gracefully."""
-        from mcp_server.agents.illustrator.agent import IllustratorAgent
-
         agent = IllustratorAgent()
         mock_session = AsyncMock()
         mock_session.call_tool.side_effect = Exception("Tool error")
@@ -399,8 +370,6 @@ class TestMcpServerTools:
     @pytest.mark.parametrize("chart_type", ["bar", "line", "pie"])
     def test_generate_chart_valid_types(self, chart_type):
         """Test chart generation for all valid types."""
-        from mcp_server.mcp_server import generate_chart
-
         with (
             tempfile.TemporaryDirectory() as tmpdir,
             patch("mcp_server.mcp_server.FILE_PATH", Path(tmpdir)),
@@ -411,8 +380,6 @@ class TestMcpServerTools:
 
     def test_create_presentation(self):
         """Test presentation creation (success and error)."""
-        from mcp_server.mcp_server import create_presentation
-
         assert "Error" in create_presentation("test", "not valid json")
 
         with (
@@ -426,32 +393,39 @@ class TestMcpServerTools:
             assert "Successfully saved" in result
             assert os.path.exists(Path(tmpdir) / "test_ppt.pptx")
 
+    @pytest.mark.asyncio
     @patch("mcp_server.mcp_server.tavily_client")
     @patch("mcp_server.mcp_server.source_validator")
-    def test_search_web(self, mock_validator, mock_tavily):
+    async def test_search_web(self, mock_validator, mock_tavily):
         """Test web search with various scenarios."""
-        from mcp_server.mcp_server import search_web
-
         mock_tavily.search.return_value = {
             "results": [{"content": "Content", "url": "https://example.com"}]
         }
-        mock_validator.rank_sources.return_value = [
-            {
-                "content": "Content",
-                "url": "https://example.com",
-                "validation": {"tier": "S", "score": 90},
-            }
-        ]
-        result = json.loads(search_web("query"))
+        mock_validator.rank_sources = AsyncMock(
+            return_value=[
+                {
+                    "content": "Content",
+                    "url": "https://example.com",
+                    "validation": {"tier": "S", "score": 90},
+                }
+            ]
+        )
+        result = json.loads(await search_web("query"))
         assert len(result) == 1 and result[0]["validation"]["tier"] == "S"
 
-        mock_validator.rank_sources.return_value = [
-            {"content": "Low", "url": "https://bad.com", "validation": {"tier": "C", "score": 30}}
-        ]
-        assert json.loads(search_web("query")) == []
+        mock_validator.rank_sources = AsyncMock(
+            return_value=[
+                {
+                    "content": "Low",
+                    "url": "https://bad.com",
+                    "validation": {"tier": "C", "score": 30},
+                }
+            ]
+        )
+        assert json.loads(await search_web("query")) == []
 
         mock_tavily.search.side_effect = Exception("API Error")
-        assert "Error" in search_web("query")
+        assert "Error" in await search_web("query")
 
 
 class TestPresentationRoutes:
@@ -460,10 +434,6 @@ class TestPresentationRoutes:
     @pytest.fixture
     def client(self):
         """Create test client."""
-        from fastapi import FastAPI
-
-        from app.routes.presentation.router import presentation_router
-
         app = FastAPI()
         app.include_router(presentation_router)
         return TestClient(app)